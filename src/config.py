@@ -19,6 +19,16 @@ CHUNK_MODEL = "claude-haiku-4-5-20251001"
 # Chunking
 CHUNK_SIZE = 3000   # words
 CHUNK_OVERLAP = 200  # words
+CHUNK_CONCURRENCY = int(os.getenv("CHUNK_CONCURRENCY", "6"))  # parallel chunk calls
+
+# Watcher: PDFs processed concurrently when several land at once
+PAPER_WORKERS = int(os.getenv("PAPER_WORKERS", "2"))
+
+# LLM response cache (SQLite, keyed by sha256(model + prompt))
+LLM_CACHE_PATH = Path(os.getenv(
+    "LLM_CACHE_PATH", str(Path.home() / ".cache" / "paperagent" / "llm_cache.sqlite3")
+))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
 
 # File ignore rules
 IGNORE_EXTENSIONS = {".crdownload", ".part", ".tmp"}
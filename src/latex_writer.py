@@ -1,51 +1,52 @@
-import re
 from pathlib import Path
 
 # LaTeX template — do NOT modify
-LATEX_TEMPLATE = r"""\documentclass[11pt]{article}
-\usepackage[margin=1in]{geometry}
-\usepackage{setspace}
-\usepackage{hyperref}
-\usepackage{times}
-\usepackage{setspace}
-\usepackage{xurl}
-\usepackage{float}
+# Rendered with str.format_map: literal braces are doubled, {name} are slots.
+LATEX_TEMPLATE = r"""\documentclass[11pt]{{article}}
+\usepackage[margin=1in]{{geometry}}
+\usepackage{{setspace}}
+\usepackage{{hyperref}}
+\usepackage{{times}}
+\usepackage{{setspace}}
+\usepackage{{xurl}}
+\usepackage{{float}}
 \singlespacing
 
-\begin{document}
-\begin{center}
-    {\LARGE \textbf{TITULO_PAPER}} \\[2ex]
+\begin{{document}}
+\begin{{center}}
+    {{\LARGE \textbf{{{title}}}}} \\[2ex]
     \normalsize
-\end{center}
+\end{{center}}
 
-\begin{center}
-    {\textbf{Anna Monsó Rodriguez}} \\[2ex]
+\begin{{center}}
+    {{\textbf{{Anna Monsó Rodriguez}}}} \\[2ex]
     \normalsize
-\end{center}
+\end{{center}}
 
-\section*{Paper Summary}
-SUMMARY_TEXT
+\section*{{Paper Summary}}
+{summary}
 
-\section*{Contributions}
-\begin{itemize}
-CONTRIBUTIONS_ITEMS
-\end{itemize}
+\section*{{Contributions}}
+\begin{{itemize}}
+{contributions}
+\end{{itemize}}
 
-\section*{Limitations}
-\begin{itemize}
-LIMITATIONS_ITEMS
-\end{itemize}
+\section*{{Limitations}}
+\begin{{itemize}}
+{limitations}
+\end{{itemize}}
 
-\section*{One Question to Discuss}
-QUESTION_TEXT
+\section*{{One Question to Discuss}}
+{question}
 
-\vspace{2\baselineskip}
-\textit{Note:} I used \href{https://www.deepl.com/es/write}{www.deepl.com} to improve the quality of my text.
-\end{document}
+\vspace{{2\baselineskip}}
+\textit{{Note:}} I used \href{{https://www.deepl.com/es/write}}{{www.deepl.com}} to improve the quality of my text.
+\end{{document}}
 """
 
-# Characters to escape in user-generated content (order matters: backslash first)
-_ESCAPE_MAP = {
+# Characters to escape in user-generated content, as a str.translate table
+# (one C-level pass, each char mapped independently — no ordering issues)
+_ESCAPE_TABLE = str.maketrans({
     "\\": r"\textbackslash{}",
     "%":  r"\%",
     "$":  r"\$",
@@ -56,42 +57,29 @@ _ESCAPE_MAP = {
     "~":  r"\textasciitilde{}",
     "^":  r"\textasciicircum{}",
     "&":  r"\&",
-}
-
-# Single-pass regex: matches any special char
-_ESCAPE_RE = re.compile(r'([\\%$#_{}~^&])')
+})
 
 
 def escape_latex(text: str) -> str:
     """Escape special LaTeX characters in user-supplied text."""
-    return _ESCAPE_RE.sub(lambda m: _ESCAPE_MAP[m.group(0)], text)
-
+    return text.translate(_ESCAPE_TABLE)
 
-def fill_template(data: dict) -> str:
-    """Fill the LaTeX template with structured data. Returns complete .tex string."""
-    title = escape_latex(data["title"])
-    summary = escape_latex(data["summary"])
 
-    contributions_lines = []
-    for item in data["contributions"]:
-        label = escape_latex(item["label"])
-        text = escape_latex(item["text"])
-        contributions_lines.append(f"    \\item \\textbf{{{label}:}} {text}")
-    contributions = "\n".join(contributions_lines)
+def _format_items(items: list[dict]) -> str:
+    """Render {label, text} items as escaped \\item lines in a single pass."""
+    return "\n".join(
+        f"    \\item \\textbf{{{item['label'].translate(_ESCAPE_TABLE)}:}} "
+        f"{item['text'].translate(_ESCAPE_TABLE)}"
+        for item in items
+    )
 
-    limitations_lines = []
-    for item in data["limitations"]:
-        label = escape_latex(item["label"])
-        text = escape_latex(item["text"])
-        limitations_lines.append(f"    \\item \\textbf{{{label}:}} {text}")
-    limitations = "\n".join(limitations_lines)
 
-    question = escape_latex(data["question"])
-
-    tex = LATEX_TEMPLATE
-    tex = tex.replace("TITULO_PAPER", title)
-    tex = tex.replace("SUMMARY_TEXT", summary)
-    tex = tex.replace("CONTRIBUTIONS_ITEMS", contributions)
-    tex = tex.replace("LIMITATIONS_ITEMS", limitations)
-    tex = tex.replace("QUESTION_TEXT", question)
-    return tex
+def fill_template(data: dict) -> str:
+    """Fill the LaTeX template with structured data. Returns complete .tex string."""
+    return LATEX_TEMPLATE.format_map({
+        "title": escape_latex(data["title"]),
+        "summary": escape_latex(data["summary"]),
+        "contributions": _format_items(data["contributions"]),
+        "limitations": _format_items(data["limitations"]),
+        "question": escape_latex(data["question"]),
+    })
@@ -0,0 +1,77 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+from config import LLM_CACHE_PATH, LLM_CACHE_TTL
+
+_enabled = True
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
+
+
+def disable() -> None:
+    """Turn the cache off for this process (e.g. --no-cache)."""
+    global _enabled
+    _enabled = False
+
+
+def make_key(model: str, prompt: str) -> str:
+    """Cache key for a single-turn query: sha256 of model and prompt."""
+    return hashlib.sha256((model + "\0" + prompt).encode("utf-8")).hexdigest()
+
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        LLM_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(LLM_CACHE_PATH), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        # Drop expired rows so the table doesn't grow without bound
+        conn.execute(
+            "DELETE FROM responses WHERE created_at < ?",
+            (time.time() - LLM_CACHE_TTL,),
+        )
+        conn.commit()
+        _conn = conn
+    return _conn
+
+
+def get(key: str) -> str | None:
+    """Return the cached response for `key`, or None if missing or expired."""
+    if not _enabled:
+        return None
+    try:
+        with _lock:
+            row = _connect().execute(
+                "SELECT value FROM responses WHERE key = ? AND created_at >= ?",
+                (key, time.time() - LLM_CACHE_TTL),
+            ).fetchone()
+    except sqlite3.Error as e:
+        logging.warning(f"LLM cache read failed ({e}), ignoring cache")
+        return None
+    return row[0] if row else None
+
+
+def set(key: str, value: str) -> None:
+    """Store a response under `key`, replacing any previous entry."""
+    if not _enabled:
+        return
+    try:
+        with _lock:
+            conn = _connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        logging.warning(f"LLM cache write failed ({e})")
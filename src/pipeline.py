@@ -1,86 +1,153 @@
 import asyncio
-import json
+import io
 import logging
+import math
 import re
 import sys
+from collections.abc import Callable
 from pathlib import Path
 
+import orjson
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_fixed,
+    wait_random_exponential,
+)
+
 sys.path.insert(0, str(Path(__file__).parent))
-from config import CHUNK_MODEL, CHUNK_OVERLAP, CHUNK_SIZE, MAIN_MODEL
+from config import (
+    CHUNK_CONCURRENCY,
+    CHUNK_MODEL,
+    CHUNK_OVERLAP,
+    CHUNK_SIZE,
+    MAIN_MODEL,
+)
+import llm_cache
 
 
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
-async def _query_claude(prompt: str, model: str, retries: int = 3) -> str:
+_CLAUDE_ATTEMPTS = 5
+
+
+def _is_rate_limit(exc: BaseException) -> bool:
+    return "rate_limit" in str(exc).lower()
+
+
+def _log_rate_limit(retry_state) -> None:
+    logging.warning(
+        f"Rate limited — waiting {retry_state.next_action.sleep:.0f}s before retry "
+        f"{retry_state.attempt_number + 1}/{_CLAUDE_ATTEMPTS}..."
+    )
+
+
+async def _query_claude(
+    prompt: str,
+    model: str,
+    validate: Callable[[str], object] | None = None,
+) -> str:
     """Run a single-turn Claude query and return the full text response.
 
-    Retries automatically on rate-limit events (the installed SDK version
-    surfaces these as MessageParseError instead of handling them internally).
+    Responses are cached on disk by (model, prompt), so reprocessing the same
+    PDF skips the API call. If `validate` is given, a response is only cached
+    once it returns without raising, so a malformed reply is never replayed.
+    """
+    key = llm_cache.make_key(model, prompt)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        logging.info("Using cached Claude response")
+        return cached
+
+    result = await _query_claude_uncached(prompt, model)
+    if result:
+        if validate is not None:
+            validate(result)
+        llm_cache.set(key, result)
+    return result
+
+
+@retry(
+    # 20s floor + jitter: four waits total 80-255s (baseline: 60s + 120s), so
+    # retries span at least one per-minute rate-limit window even when
+    # several chunk calls hit the limit together.
+    wait=wait_fixed(20) + wait_random_exponential(multiplier=15, max=70),
+    stop=stop_after_attempt(_CLAUDE_ATTEMPTS),
+    retry=retry_if_exception(_is_rate_limit),
+    before_sleep=_log_rate_limit,
+    reraise=True,
+)
+async def _query_claude_uncached(prompt: str, model: str) -> str:
+    """Query Claude, retrying rate-limit errors with jittered exponential backoff.
+
+    The installed SDK version surfaces rate limits as MessageParseError
+    instead of handling them internally, so we match on the message text.
     """
     from claude_code_sdk import ClaudeCodeOptions, query
 
-    for attempt in range(retries):
-        try:
-            parts = []
-            async for message in query(
-                prompt=prompt,
-                options=ClaudeCodeOptions(model=model, max_turns=1),
-            ):
-                if hasattr(message, "content"):
-                    for block in message.content:
-                        if hasattr(block, "text"):
-                            parts.append(block.text)
-            return "".join(parts).strip()
-
-        except Exception as e:
-            is_rate_limit = "rate_limit" in str(e).lower()
-            if is_rate_limit and attempt < retries - 1:
-                wait = 60 * (attempt + 1)
-                logging.warning(
-                    f"Rate limited — waiting {wait}s before retry "
-                    f"{attempt + 2}/{retries}..."
-                )
-                await asyncio.sleep(wait)
-            else:
-                raise
+    buf = io.StringIO()
+    async for message in query(
+        prompt=prompt,
+        options=ClaudeCodeOptions(model=model, max_turns=1),
+    ):
+        if hasattr(message, "content"):
+            for block in message.content:
+                if hasattr(block, "text"):
+                    buf.write(block.text)
+    return buf.getvalue().strip()
+
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*")
+_OBJ_RE = re.compile(r"\{[\s\S]*\}")
 
-    return ""
+
+def _strip_code_fences(text: str) -> str:
+    """Remove a surrounding ```/```json fence, if the whole reply is fenced."""
+    t = text.strip()
+    if t.startswith("```") and t.endswith("```"):
+        nl = t.find("\n")
+        if nl != -1:
+            t = t[nl + 1 : -3].strip()
+    return t
 
 
 def _extract_json(text: str) -> dict:
     """Extract a JSON object from Claude's response (handles markdown fences)."""
-    # Strip common markdown code fences
-    cleaned = re.sub(r"```(?:json)?\s*", "", text).strip()
+    cleaned = _strip_code_fences(text)
     try:
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
+        return orjson.loads(cleaned)
+    except orjson.JSONDecodeError:
         pass
 
-    # Find the outermost {...} block
-    match = re.search(r"\{[\s\S]*\}", cleaned)
+    # Fallback: drop any stray fences and find the outermost {...} block
+    cleaned = _FENCE_RE.sub("", text).strip()
+    match = _OBJ_RE.search(cleaned)
     if match:
         try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
+            return orjson.loads(match.group())
+        except orjson.JSONDecodeError:
             pass
 
     raise ValueError(f"Could not parse JSON from Claude response:\n{text[:400]}")
 
 
-def _chunk_text(text: str) -> list[str]:
-    """Split text into overlapping word-based chunks."""
-    words = text.split()
-    chunks = []
-    i = 0
-    while i < len(words):
-        chunk_words = words[i : i + CHUNK_SIZE]
-        chunks.append(" ".join(chunk_words))
-        if i + CHUNK_SIZE >= len(words):
-            break
-        i += CHUNK_SIZE - CHUNK_OVERLAP
-    return chunks
+def _chunk_text(words: list[str]) -> list[str]:
+    """Split a word list into overlapping word-based chunks.
+
+    Chunk i starts at i * stride (stride = CHUNK_SIZE - CHUNK_OVERLAP); the
+    last chunk is the first one that reaches the end of the text.
+    """
+    if not words:
+        return []
+    stride = CHUNK_SIZE - CHUNK_OVERLAP
+    n_chunks = math.ceil(max(len(words) - CHUNK_SIZE, 0) / stride) + 1
+    return [
+        " ".join(words[i * stride : i * stride + CHUNK_SIZE])
+        for i in range(n_chunks)
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -101,7 +168,7 @@ Rules:
 - contributions: 2 to 4 items
 - limitations: 1 to 3 items
 - Total words across summary + contributions + limitations + question: max 500
-- Return ONLY valid JSON — no markdown, no code fences, no explanations"""
+- Return ONLY valid JSON — no markdown, no ```json code fences, no explanations; the first character must be {"""
 
 
 def _build_summary_prompt(text: str, filename: str) -> str:
@@ -151,29 +218,46 @@ async def run_pipeline(text: str, filename: str) -> dict:
         {title, summary, contributions, limitations, question}
     Uses MAIN_MODEL for the final pass and CHUNK_MODEL for intermediate chunks.
     """
-    word_count = len(text.split())
+    words = text.split()
+    word_count = len(words)
 
     if word_count > CHUNK_SIZE:
         logging.info(f"Text exceeds {CHUNK_SIZE} words ({word_count}), chunking...")
-        chunks = _chunk_text(text)
+        chunks = _chunk_text(words)
         logging.info(f"Split into {len(chunks)} chunks")
 
-        # Summarise each chunk sequentially to avoid rate limits
-        chunk_summaries = []
-        for i, c in enumerate(chunks):
-            logging.info(f"Summarising chunk {i + 1}/{len(chunks)}...")
-            summary = await _query_claude(
-                _build_chunk_prompt(c, i + 1, len(chunks)), CHUNK_MODEL
-            )
-            chunk_summaries.append(summary)
+        # Summarise chunks concurrently; the semaphore caps in-flight calls
+        # to stay under rate limits. The TaskGroup cancels the remaining
+        # chunk calls as soon as one fails for good.
+        sem = asyncio.Semaphore(max(1, CHUNK_CONCURRENCY))
+
+        async def _summarise(i: int, c: str) -> str:
+            async with sem:
+                logging.info(f"Summarising chunk {i + 1}/{len(chunks)}...")
+                return await _query_claude(
+                    _build_chunk_prompt(c, i + 1, len(chunks)), CHUNK_MODEL
+                )
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(_summarise(i, c)) for i, c in enumerate(chunks)
+                ]
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        chunk_summaries = [t.result() for t in tasks]
 
         consolidated = "\n\n".join(chunk_summaries)
         logging.info("Consolidating chunk summaries with main model...")
         response = await _query_claude(
-            _build_consolidation_prompt(consolidated, filename), MAIN_MODEL
+            _build_consolidation_prompt(consolidated, filename),
+            MAIN_MODEL,
+            validate=_extract_json,
         )
     else:
-        response = await _query_claude(_build_summary_prompt(text, filename), MAIN_MODEL)
+        response = await _query_claude(
+            _build_summary_prompt(text, filename), MAIN_MODEL, validate=_extract_json
+        )
 
     logging.info("Summary generated")
     data = _extract_json(response)
@@ -1,56 +1,125 @@
+import asyncio
+import io
 import logging
-import os
 
 import requests
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+import llm_cache
+from config import DEEPL_API_KEY, DEEPL_API_URL
 
 DEEPL_FALLBACK_PROMPT = (
     "Rewrite the following academic text to improve clarity and academic tone. "
     "Keep the original meaning. Be concise. Maximum 500 words total. "
     "Return only the rewritten text, no explanations:"
 )
+FALLBACK_MODEL = "claude-haiku-4-5-20251001"
 
 
-async def rewrite_text(text: str) -> str:
-    """Rewrite text using DeepL API, with Claude as fallback."""
-    api_key = os.getenv("DEEPL_API_KEY", "")
-    if api_key:
+async def rewrite_texts(texts: list[str]) -> list[str]:
+    """Rewrite several texts using DeepL API, with Claude as fallback.
+
+    Results come back in input order. DeepL takes them all in a single
+    request; the Claude fallback rewrites them concurrently.
+    """
+    if DEEPL_API_KEY:
         try:
-            return _rewrite_with_deepl(text, api_key)
+            # requests is blocking; run it off the event loop
+            return await asyncio.to_thread(_rewrite_with_deepl, texts, DEEPL_API_KEY)
         except Exception as e:
             logging.warning(f"DeepL failed ({e}), using Claude fallback")
 
     logging.info("DeepL unavailable, using Claude fallback")
-    return await _rewrite_with_claude(text)
+    return list(await asyncio.gather(*(_rewrite_with_claude(t) for t in texts)))
+
+
+# Shared session: keeps the TLS connection to DeepL alive between papers
+_SESSION = requests.Session()
+
+_DEEPL_ATTEMPTS = 4
+_DEEPL_MAX_RETRY_AFTER = 60  # seconds; longer waits go to the Claude fallback
+_deepl_backoff = wait_random_exponential(multiplier=1, max=30)
+
 
+def _retry_after(exc: BaseException) -> float | None:
+    """Seconds from a Retry-After header on the failed response, if any."""
+    response = getattr(exc, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+    return None
 
-def _rewrite_with_deepl(text: str, api_key: str) -> str:
-    response = requests.post(
-        "https://api.deepl.com/v2/translate",
+
+def _is_transient(exc: BaseException) -> bool:
+    """Retry on connection problems, 429 Too Many Requests and 5xx, unless
+    DeepL asks us to wait longer than _DEEPL_MAX_RETRY_AFTER."""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        if status != 429 and status < 500:
+            return False
+        retry_after = _retry_after(exc)
+        return retry_after is None or retry_after <= _DEEPL_MAX_RETRY_AFTER
+    return False
+
+
+def _deepl_wait(retry_state) -> float:
+    """Honour a Retry-After header when DeepL sends one, else back off."""
+    retry_after = _retry_after(retry_state.outcome.exception())
+    if retry_after is not None:
+        return min(retry_after, _DEEPL_MAX_RETRY_AFTER)
+    return _deepl_backoff(retry_state)
+
+
+@retry(
+    wait=_deepl_wait,
+    stop=stop_after_attempt(_DEEPL_ATTEMPTS),
+    retry=retry_if_exception(_is_transient),
+    reraise=True,
+)
+def _rewrite_with_deepl(texts: list[str], api_key: str) -> list[str]:
+    response = _SESSION.post(
+        DEEPL_API_URL,
         headers={"Authorization": f"DeepL-Auth-Key {api_key}"},
         json={
-            "text": [text],
+            "text": texts,
             "target_lang": "EN-US",
             "source_lang": "EN",
         },
         timeout=30,
     )
     response.raise_for_status()
-    return response.json()["translations"][0]["text"]
+    return [t["text"] for t in response.json()["translations"]]
 
 
 async def _rewrite_with_claude(text: str) -> str:
     from claude_code_sdk import ClaudeCodeOptions, query
 
     prompt = f"{DEEPL_FALLBACK_PROMPT}\n\n{text}"
-    result_parts = []
+    key = llm_cache.make_key(FALLBACK_MODEL, prompt)
+    cached = llm_cache.get(key)
+    if cached is not None:
+        return cached
+
+    buf = io.StringIO()
 
     async for message in query(
         prompt=prompt,
-        options=ClaudeCodeOptions(model="claude-haiku-4-5-20251001", max_turns=1),
+        options=ClaudeCodeOptions(model=FALLBACK_MODEL, max_turns=1),
     ):
         if hasattr(message, "content"):
             for block in message.content:
                 if hasattr(block, "text"):
-                    result_parts.append(block.text)
+                    buf.write(block.text)
 
-    return "".join(result_parts).strip() or text
+    result = buf.getvalue().strip()
+    if result:
+        llm_cache.set(key, result)
+    return result or text
@@ -1,37 +1,198 @@
+import asyncio
+import hashlib
 import logging
+import os
 import shutil
-import subprocess
 from pathlib import Path
 
+COMPILE_TIMEOUT = 120  # seconds
+LATEXMKRC = Path(__file__).parent / "latexmkrc"
+AUX_DIR = ".aux"  # relative to the .tex folder; keeps .fdb_latexmk between runs
+FORMAT_PREFIX = "papermemoflow-"
 
-def compile_latex(tex_path: Path) -> bool:
-    """Compile a .tex file to PDF using latexmk. Returns True on success."""
-    if not shutil.which("latexmk"):
-        logging.info("latexmk not installed, skipping PDF compilation")
+# Resolved once: the toolchain doesn't move while the watcher runs
+_PDFLATEX = shutil.which("pdflatex")
+_LATEXMK = shutil.which("latexmk")
+
+# Part of the format hash: a pdftex upgrade rejects older .fmt files
+_ENGINE_STAMP = (
+    f"{os.path.realpath(_PDFLATEX)}:{os.stat(_PDFLATEX).st_mtime_ns}"
+    if _PDFLATEX else ""
+)
+
+_BEGIN_DOCUMENT = "\\begin{document}"
+_format_lock = asyncio.Lock()
+_failed_formats: set[str] = set()  # names whose -ini build failed this run
+
+# pdflatex output when a .fmt can't be loaded, as opposed to document errors
+_FORMAT_LOAD_ERRORS = (
+    "Fatal format file error",
+    "can't find the format file",
+    "made by different executable version",
+)
+
+
+async def compile_latex(tex_path: Path) -> bool:
+    """Compile a .tex file to PDF. Returns True on success.
+
+    Prefers a single pdflatex pass on a precompiled format that already
+    contains the document preamble (the summaries have no cross-references),
+    and falls back to latexmk if that is unavailable or fails.
+    """
+    try:
+        if _PDFLATEX and await _compile_with_format(tex_path):
+            return True
+
+        if not _LATEXMK:
+            logging.info("latexmk not installed, skipping PDF compilation")
+            return False
+        return await _compile_with_latexmk(tex_path)
+    except asyncio.TimeoutError:
+        logging.error("LaTeX compilation timed out")
         return False
+    except Exception as e:
+        logging.error(f"LaTeX compilation error: {e}")
+        return False
+
 
+async def _run(argv: list[str], cwd: Path, env: dict | None = None) -> tuple[int, str, str]:
+    """Run a subprocess without blocking the event loop; kill it on timeout."""
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        cwd=cwd,
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
     try:
-        result = subprocess.run(
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), COMPILE_TIMEOUT)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return (
+        proc.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
+async def _compile_with_latexmk(tex_path: Path) -> bool:
+    """latexmk with the shipped rc: no bibtex, aux kept in .aux/ between runs."""
+    returncode, _, stderr = await _run(
+        [
+            _LATEXMK,
+            "-r", str(LATEXMKRC),
+            "-pdf",
+            "-interaction=nonstopmode",
+            "-halt-on-error",
+            "-outdir=.",
+            f"-auxdir={AUX_DIR}",
+            str(tex_path.name),
+        ],
+        cwd=tex_path.parent,
+    )
+    if returncode == 0:
+        return True
+    logging.error(f"latexmk exited with code {returncode}")
+    logging.error(stderr[-2000:] if stderr else "(no stderr)")
+    return False
+
+
+async def _compile_with_format(tex_path: Path) -> bool:
+    """One pdflatex pass using a format with the preamble already dumped.
+
+    The format is named after a hash of the preamble and the pdflatex binary,
+    so it is built once and rebuilt when either changes. If pdflatex still
+    rejects the format, it is discarded and rebuilt once; document errors
+    go straight to the latexmk fallback.
+    """
+    tex = tex_path.read_text(encoding="utf-8")
+    split = tex.find(_BEGIN_DOCUMENT)
+    if split == -1:
+        return False
+    preamble, body = tex[:split], tex[split:]
+
+    # Absolute: TEXFORMATS is read by pdflatex running in tex_path.parent
+    aux_dir = (tex_path.parent / AUX_DIR).resolve()
+    aux_dir.mkdir(parents=True, exist_ok=True)
+    body_path = aux_dir / f"{tex_path.stem}.body.tex"
+    body_path.write_text(body, encoding="utf-8")
+    built_pdf = aux_dir / f"{tex_path.stem}.pdf"
+
+    # Trailing ':' keeps the default search path after our format folder
+    env = {**os.environ, "TEXFORMATS": f"{aux_dir}{os.pathsep}"}
+
+    for attempt in range(2):
+        fmt_name = await _ensure_format(aux_dir, preamble)
+        if fmt_name is None:
+            return False
+
+        returncode, stdout, _ = await _run(
             [
-                "latexmk",
-                "-pdf",
+                _PDFLATEX,
+                f"-fmt={fmt_name}",
+                f"-jobname={tex_path.stem}",
+                f"-output-directory={aux_dir}",
                 "-interaction=nonstopmode",
                 "-halt-on-error",
-                str(tex_path.name),
+                str(body_path),
             ],
             cwd=tex_path.parent,
-            capture_output=True,
-            text=True,
-            timeout=120,
+            env=env,
         )
-        if result.returncode == 0:
+        if returncode == 0 and built_pdf.exists():
+            os.replace(built_pdf, tex_path.with_suffix(".pdf"))
             return True
-        logging.error(f"latexmk exited with code {result.returncode}")
-        logging.error(result.stderr[-2000:] if result.stderr else "(no stderr)")
-        return False
-    except subprocess.TimeoutExpired:
-        logging.error("LaTeX compilation timed out")
-        return False
-    except Exception as e:
-        logging.error(f"LaTeX compilation error: {e}")
-        return False
+
+        format_rejected = any(err in stdout for err in _FORMAT_LOAD_ERRORS)
+        if not format_rejected or attempt == 1:
+            break
+        # Stale or corrupt format: discard it and rebuild once
+        logging.warning("pdflatex rejected the preloaded format, rebuilding it")
+        (aux_dir / f"{fmt_name}.fmt").unlink(missing_ok=True)
+
+    logging.warning(
+        f"pdflatex with preloaded format failed (code {returncode}), "
+        f"retrying with latexmk:\n{stdout[-1000:]}"
+    )
+    return False
+
+
+async def _ensure_format(aux_dir: Path, preamble: str) -> str | None:
+    """Return the name of a .fmt in `aux_dir` for `preamble`, building it if needed."""
+    digest = hashlib.sha256(
+        f"{_ENGINE_STAMP}\0{preamble}".encode("utf-8")
+    ).hexdigest()[:12]
+    fmt_name = f"{FORMAT_PREFIX}{digest}"
+    fmt_path = aux_dir / f"{fmt_name}.fmt"
+
+    async with _format_lock:
+        if fmt_name in _failed_formats:
+            return None
+        if fmt_path.exists():
+            return fmt_name
+
+        aux_dir.mkdir(parents=True, exist_ok=True)
+        (aux_dir / f"{fmt_name}.ini").write_text(preamble + "\\dump\n", encoding="utf-8")
+        returncode, stdout, _ = await _run(
+            [
+                _PDFLATEX,
+                "-ini",
+                f"-jobname={fmt_name}",
+                "-interaction=nonstopmode",
+                "&pdflatex",
+                f"{fmt_name}.ini",
+            ],
+            cwd=aux_dir,
+        )
+        if returncode != 0 or not fmt_path.exists():
+            logging.warning(
+                f"Could not build LaTeX format, using latexmk from now on:\n"
+                f"{stdout[-1000:]}"
+            )
+            _failed_formats.add(fmt_name)
+            return None
+
+        logging.info(f"Built LaTeX format: {fmt_path}")
+        return fmt_name
@@ -6,6 +6,7 @@ Watches ~/PapersInbox/ for new PDFs and processes them automatically.
 Usage:
   python src/watcher.py                           # normal watch mode
   python src/watcher.py --dry-run /path/file.pdf  # process a single file
+  python src/watcher.py --no-cache                # bypass the Claude response cache
 """
 
 import argparse
@@ -13,16 +14,25 @@ import asyncio
 import logging
 import os
 import sys
+import threading
 import time
+from collections.abc import Callable
 from pathlib import Path
 
 # Make src/ importable regardless of cwd
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import IGNORE_EXTENSIONS, IGNORE_PREFIXES, PAPERS_INBOX, PAPERS_OUTBOX
+import llm_cache
+from config import (
+    IGNORE_EXTENSIONS,
+    IGNORE_PREFIXES,
+    PAPER_WORKERS,
+    PAPERS_INBOX,
+    PAPERS_OUTBOX,
+)
 from latex_writer import fill_template
 from pipeline import run_pipeline
-from tools.deepl_rewrite_tool import rewrite_text
+from tools.deepl_rewrite_tool import rewrite_texts
 from tools.latex_compile_tool import compile_latex
 from tools.pdf_extract_tool import extract_text
 
@@ -54,8 +64,11 @@ def is_temp_file(path: Path) -> bool:
     )
 
 
-def wait_for_complete(path: Path, checks: int = 3, interval: float = 1.0) -> bool:
-    """Block until the file size is stable across `checks` consecutive reads."""
+def wait_for_complete(path: Path, checks: int = 5, interval: float = 0.2) -> bool:
+    """Block until the file size is stable across `checks` consecutive reads.
+
+    Only used where the observer cannot report close-after-write events.
+    """
     prev_size = -1
     stable = 0
     for _ in range(checks + 2):
@@ -83,30 +96,36 @@ async def process_pdf(pdf_path: Path) -> None:
     logging.info(f"New PDF detected: {pdf_path.name}")
 
     try:
-        # 1. Extract text
-        text = extract_text(pdf_path)
+        # 1. Extract text (blocking; keep the event loop free for other PDFs)
+        text = await asyncio.to_thread(extract_text, pdf_path)
         word_count = len(text.split())
         logging.info(f"Text extracted: {word_count} words")
 
         # 2. Summarise & structure via claude-code-sdk
         data = await run_pipeline(text, pdf_path.stem)
 
-        # 3. Rewrite summary with DeepL / Claude for academic polish
-        original_summary = data.get("summary", "")
-        rewritten_summary = await rewrite_text(original_summary)
-        data["summary"] = rewritten_summary
+        # 3. Rewrite summary, contribution and limitation texts with
+        #    DeepL / Claude for academic polish — one batched request —
+        #    preparing the output folder while it is in flight
+        items = data.get("contributions", []) + data.get("limitations", [])
+        rewrite_task = asyncio.create_task(
+            rewrite_texts([data.get("summary", "")] + [item["text"] for item in items])
+        )
+        PAPERS_OUTBOX.mkdir(parents=True, exist_ok=True)
+        tex_path = PAPERS_OUTBOX / f"{pdf_path.stem}.tex"
+        data["summary"], *item_texts = await rewrite_task
+        for item, text in zip(items, item_texts):
+            item["text"] = text
 
         # 4. Fill LaTeX template
         tex_content = fill_template(data)
 
         # 5. Write .tex file
-        PAPERS_OUTBOX.mkdir(parents=True, exist_ok=True)
-        tex_path = PAPERS_OUTBOX / f"{pdf_path.stem}.tex"
         tex_path.write_text(tex_content, encoding="utf-8")
         logging.info(f"LaTeX written: {tex_path}")
 
         # 6. Compile to PDF (optional — requires latexmk)
-        if compile_latex(tex_path):
+        if await compile_latex(tex_path):
             logging.info(f"PDF compiled: {tex_path.with_suffix('.pdf')}")
 
     except Exception as e:
@@ -117,33 +136,158 @@ async def process_pdf(pdf_path: Path) -> None:
 # Watcher
 # ---------------------------------------------------------------------------
 
+SHUTDOWN_TIMEOUT = 300  # seconds to let in-flight PDFs finish on Ctrl-C
+
+def _start_workers(
+    workers: int,
+) -> tuple[Callable[..., None], Callable[[float], None]]:
+    """Start a persistent event loop in a background thread with `workers`
+    consumers draining a queue of PDFs. Returns (submit, shutdown):
+    submit(path, wait_stable) is safe to call from any thread, and
+    shutdown(timeout) waits for queued and in-progress PDFs, then stops.
+
+    Events for a path that is already queued are coalesced; an event for a
+    path that is being processed re-queues it once the current run finishes,
+    so a file overwritten mid-run is processed again.
+    """
+    loop = asyncio.new_event_loop()
+    queue: asyncio.Queue[tuple[Path, bool]] = asyncio.Queue()
+    # Only touched from the loop thread
+    queued: set[Path] = set()
+    running: set[Path] = set()
+    dirty: dict[Path, bool] = {}  # path -> wait_stable for the re-run
+
+    async def _worker() -> None:
+        while True:
+            path, wait_stable = await queue.get()
+            queued.discard(path)
+            running.add(path)
+            try:
+                if wait_stable and not await asyncio.to_thread(wait_for_complete, path):
+                    logging.warning(f"File not stable after timeout: {path.name}")
+                else:
+                    await process_pdf(path)
+            finally:
+                running.discard(path)
+                if path in dirty:
+                    _enqueue(path, dirty.pop(path))
+                queue.task_done()
+
+    def _enqueue(path: Path, wait_stable: bool) -> None:
+        if path in queued:
+            return
+        if path in running:
+            dirty[path] = wait_stable
+            return
+        queued.add(path)
+        queue.put_nowait((path, wait_stable))
+
+    def _run() -> None:
+        asyncio.set_event_loop(loop)
+        tasks = [loop.create_task(_worker()) for _ in range(max(1, workers))]
+        try:
+            loop.run_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+    thread = threading.Thread(target=_run, name="pdf-workers", daemon=True)
+    thread.start()
+
+    def submit(path: Path, wait_stable: bool = False) -> None:
+        loop.call_soon_threadsafe(_enqueue, path, wait_stable)
+
+    def shutdown(timeout: float) -> None:
+        pending = len(queued) + len(running)
+        if pending:
+            logging.info(
+                f"Waiting up to {timeout:.0f}s for {pending} PDF(s) to finish "
+                "(Ctrl-C again to abort)..."
+            )
+        try:
+            asyncio.run_coroutine_threadsafe(queue.join(), loop).result(timeout)
+        except TimeoutError:
+            logging.warning("Shutdown timeout reached, abandoning unfinished PDFs")
+        except KeyboardInterrupt:
+            logging.warning("Aborted, abandoning unfinished PDFs")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return submit, shutdown
+
+
 def start_watcher() -> None:
     from watchdog.events import FileSystemEventHandler
     from watchdog.observers import Observer
 
+    try:
+        from watchdog.observers.inotify import InotifyObserver
+    except ImportError:  # not Linux
+        InotifyObserver = None
+
+    observer = Observer()
+    # inotify (Linux) reports IN_CLOSE_WRITE, so a closed file is complete and
+    # needs no polling. Other backends (FSEvents, Windows, polling) don't.
+    close_events = InotifyObserver is not None and isinstance(observer, InotifyObserver)
+
+    submit, shutdown = _start_workers(PAPER_WORKERS)
+
+    def _pdf_path(event, dest: bool = False) -> Path | None:
+        if event.is_directory:
+            return None
+        path = Path(event.dest_path if dest else event.src_path)
+        if path.suffix.lower() != ".pdf":
+            return None
+        if is_temp_file(path):
+            logging.info(f"Ignored temp file: {path.name}")
+            return None
+        return path
+
     class _Handler(FileSystemEventHandler):
         def on_created(self, event):
-            if event.is_directory:
+            path = _pdf_path(event)
+            if path is None:
                 return
-            path = Path(event.src_path)
-            if path.suffix.lower() != ".pdf":
+            if close_events:
+                # A new file starts empty and gets on_closed when written.
+                # One moved in from an unwatched folder arrives non-empty and
+                # gets no other event, so take it here (with a stability
+                # check in case a fast writer already put data in).
+                try:
+                    if path.stat().st_size == 0:
+                        return
+                except OSError:
+                    return
+            submit(path, wait_stable=True)
+
+        def on_closed(self, event):
+            path = _pdf_path(event)
+            if path is None:
                 return
-            if is_temp_file(path):
-                logging.info(f"Ignored temp file: {path.name}")
+            try:
+                if path.stat().st_size == 0:
+                    return  # empty placeholder; the real file arrives later
+            except OSError:
                 return
-            if wait_for_complete(path):
-                asyncio.run(process_pdf(path))
-            else:
-                logging.warning(f"File not stable after timeout: {path.name}")
+            submit(path)
+
+        def on_moved(self, event):
+            # Downloaders often write "x.pdf.part" and rename it to "x.pdf";
+            # the rename is atomic, so the file is complete on arrival.
+            path = _pdf_path(event, dest=True)
+            if path is not None:
+                submit(path)
 
     PAPERS_INBOX.mkdir(parents=True, exist_ok=True)
     PAPERS_OUTBOX.mkdir(parents=True, exist_ok=True)
 
     logging.info(f"Watching: {PAPERS_INBOX}")
     logging.info(f"Output:   {PAPERS_OUTBOX}")
+    logging.info(f"Workers:  {PAPER_WORKERS}")
 
     handler = _Handler()
-    observer = Observer()
     observer.schedule(handler, str(PAPERS_INBOX), recursive=False)
     observer.start()
 
@@ -154,6 +298,7 @@ def start_watcher() -> None:
         logging.info("Stopping watcher...")
         observer.stop()
     observer.join()
+    shutdown(SHUTDOWN_TIMEOUT)
 
 
 # ---------------------------------------------------------------------------
@@ -189,8 +334,16 @@ def main() -> None:
         metavar="PDF_PATH",
         help="Process a single PDF file without watching the inbox folder",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query Claude, ignoring and not updating the response cache",
+    )
     args = parser.parse_args()
 
+    if args.no_cache:
+        llm_cache.disable()
+
     if args.dry_run:
         pdf_path = Path(args.dry_run).expanduser().resolve()
         if not pdf_path.exists():